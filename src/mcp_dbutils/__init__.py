@@ -11,6 +11,12 @@ from importlib.metadata import metadata
 from .log import create_logger
 from .base import DatabaseServer
 
+# uvloop 不支持 Windows，缺失时回退到 asyncio 默认事件循环
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # 获取包信息
 pkg_meta = metadata("mcp-dbutils")
 
@@ -62,6 +68,9 @@ async def run_server():
 
 def main():
     """命令行入口函数"""
-    asyncio.run(run_server())
+    if uvloop is not None:
+        uvloop.run(run_server())
+    else:
+        asyncio.run(run_server())
 
 __all__ = ['main']
@@ -24,11 +24,48 @@ import mcp.types as types
 from mcp.shared.session import RequestResponder
 
 from .log import create_logger
+from .sql import is_select_query
 from .stats import ResourceStats
 
 # 获取包信息用于日志命名
 pkg_meta = metadata("mcp-dbutils")
 
+# Tool definitions are static, so they are built once and shared by every list_tools call
+TOOLS = [
+    types.Tool(
+        name="query",
+        description="Execute read-only SQL query",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "Database configuration name"
+                },
+                "sql": {
+                    "type": "string",
+                    "description": "SQL query (SELECT only)"
+                }
+            },
+            "required": ["database", "sql"]
+        }
+    ),
+    types.Tool(
+        name="refresh_schema_cache",
+        description="Clear cached table and schema metadata",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "Database configuration name"
+                }
+            },
+            "required": ["database"]
+        }
+    )
+]
+
 class DatabaseHandler(ABC):
     """Abstract base class defining common interface for database handlers"""
 
@@ -80,6 +117,10 @@ class DatabaseHandler(ABC):
             self.log("error", f"Query error - {str(e)}\nResource stats: {json.dumps(self.stats.to_dict())}")
             raise
 
+    def clear_cache(self):
+        """Clear cached schema metadata, if the handler keeps any"""
+        pass
+
     @abstractmethod
     async def cleanup(self):
         """Cleanup resources"""
@@ -104,6 +145,8 @@ class DatabaseServer:
             name=pkg_meta["Name"],
             version=pkg_meta["Version"]
         )
+        # Handlers are kept across requests so their connection pools can be reused
+        self._handlers: dict[str, DatabaseHandler] = {}
         self._setup_handlers()
         self._setup_prompts()
 
@@ -142,24 +185,27 @@ class DatabaseServer:
 
             db_config = config['databases'][database]
 
-            handler = None
+            handler = self._handlers.get(database)
             try:
-                if 'type' not in db_config:
-                    raise ConfigurationError("Database configuration must include 'type' field")
-
-                db_type = db_config['type']
-                self.logger("debug", f"Creating handler for database type: {db_type}")
-                if db_type == 'sqlite':
-                    from .sqlite.handler import SqliteHandler
-                    handler = SqliteHandler(self.config_path, database, self.debug)
-                elif db_type == 'postgres':
-                    from .postgres.handler import PostgresHandler
-                    handler = PostgresHandler(self.config_path, database, self.debug)
-                else:
-                    raise ConfigurationError(f"Unsupported database type: {db_type}")
+                if handler is None:
+                    if 'type' not in db_config:
+                        raise ConfigurationError("Database configuration must include 'type' field")
+
+                    db_type = db_config['type']
+                    self.logger("debug", f"Creating handler for database type: {db_type}")
+                    if db_type == 'sqlite':
+                        from .sqlite.handler import SqliteHandler
+                        handler = SqliteHandler(self.config_path, database, self.debug)
+                    elif db_type == 'postgres':
+                        from .postgres.handler import PostgresHandler
+                        handler = PostgresHandler(self.config_path, database, self.debug)
+                    else:
+                        raise ConfigurationError(f"Unsupported database type: {db_type}")
+
+                    self._handlers[database] = handler
+                    self.logger("debug", f"Handler created successfully for {database}")
 
                 handler.stats.record_connection_start()
-                self.logger("debug", f"Handler created successfully for {database}")
                 self.logger("info", f"Resource stats: {json.dumps(handler.stats.to_dict())}")
                 yield handler
             except yaml.YAMLError as e:
@@ -168,10 +214,16 @@ class DatabaseServer:
                 raise ConfigurationError(f"Failed to import handler for {db_type}: {str(e)}")
             finally:
                 if handler:
-                    self.logger("debug", f"Cleaning up handler for {database}")
                     handler.stats.record_connection_end()
-                    self.logger("info", f"Final resource stats: {json.dumps(handler.stats.to_dict())}")
-                    await handler.cleanup()
+                    self.logger("info", f"Resource stats: {json.dumps(handler.stats.to_dict())}")
+
+    async def cleanup(self):
+        """Cleanup all database handlers"""
+        for database, handler in self._handlers.items():
+            self.logger("debug", f"Cleaning up handler for {database}")
+            self.logger("info", f"Final resource stats: {json.dumps(handler.stats.to_dict())}")
+            await handler.cleanup()
+        self._handlers.clear()
 
     def _setup_handlers(self):
         """Setup MCP handlers"""
@@ -202,53 +254,44 @@ class DatabaseServer:
 
         @self.server.list_tools()
         async def handle_list_tools() -> list[types.Tool]:
-            return [
-                types.Tool(
-                    name="query",
-                    description="Execute read-only SQL query",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "database": {
-                                "type": "string",
-                                "description": "Database configuration name"
-                            },
-                            "sql": {
-                                "type": "string",
-                                "description": "SQL query (SELECT only)"
-                            }
-                        },
-                        "required": ["database", "sql"]
-                    }
-                )
-            ]
+            return TOOLS
 
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
-            if name != "query":
+            if name not in ("query", "refresh_schema_cache"):
                 raise ConfigurationError(f"Unknown tool: {name}")
 
             if "database" not in arguments:
                 raise ConfigurationError("Database configuration name must be specified")
 
+            if name == "refresh_schema_cache":
+                database = arguments["database"]
+                async with self.get_handler(database) as handler:
+                    handler.clear_cache()
+                return [types.TextContent(type="text", text=f"Schema cache cleared for {database}")]
+
             sql = arguments.get("sql", "").strip()
             if not sql:
                 raise ConfigurationError("SQL query cannot be empty")
 
-            # Only allow SELECT statements
-            if not sql.lower().startswith("select"):
+            # Only allow read-only SELECT statements
+            if not is_select_query(sql):
                 raise ConfigurationError("Only SELECT queries are supported for security reasons")
 
             database = arguments["database"]
             async with self.get_handler(database) as handler:
                 result = await handler.execute_query(sql)
+                # One item, so clients always receive a complete JSON document
                 return [types.TextContent(type="text", text=result)]
 
     async def run(self):
         """Run server"""
-        async with mcp.server.stdio.stdio_server() as streams:
-            await self.server.run(
-                streams[0],
-                streams[1],
-                self.server.create_initialization_options()
-            )
+        try:
+            async with mcp.server.stdio.stdio_server() as streams:
+                await self.server.run(
+                    streams[0],
+                    streams[1],
+                    self.server.create_initialization_options()
+                )
+        finally:
+            await self.cleanup()
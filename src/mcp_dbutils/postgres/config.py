@@ -11,6 +11,8 @@ class PostgresConfig(DatabaseConfig):
     host: str = 'localhost'
     port: str = '5432'
     local_host: Optional[str] = None
+    pool_min_size: int = 1
+    pool_max_size: int = 25
     type: Literal['postgres'] = 'postgres'
 
     @classmethod
@@ -42,18 +44,22 @@ class PostgresConfig(DatabaseConfig):
             host=db_config.get('host', 'localhost'),
             port=str(db_config.get('port', 5432)),
             local_host=local_host,
+            pool_min_size=int(db_config.get('pool_min_size', 1)),
+            pool_max_size=int(db_config.get('pool_max_size', 25)),
         )
+        if not 0 <= config.pool_min_size <= config.pool_max_size or config.pool_max_size < 1:
+            raise ValueError("pool_min_size must be between 0 and pool_max_size, and pool_max_size at least 1")
         config.debug = cls.get_debug_mode()
         return config
 
     def get_connection_params(self) -> Dict[str, Any]:
-        """Get psycopg2 connection parameters"""
+        """Get asyncpg connection parameters"""
         params = {
-            'dbname': self.dbname,
+            'database': self.dbname,
             'user': self.user,
             'password': self.password,
             'host': self.local_host or self.host,
-            'port': self.port
+            'port': int(self.port)
         }
         return {k: v for k, v in params.items() if v}
 
@@ -1,12 +1,165 @@
 """PostgreSQL database handler implementation"""
 
-import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+import asyncio
+import json
+import re
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+import asyncpg
 import mcp.types as types
 
-from ..base import DatabaseHandler, DatabaseError
+from ..base import DatabaseHandler, DatabaseError, ConnectionError
+from ..sql import SELECT_KEYWORDS, first_keyword, parameterize
 from .config import PostgresConfig
 
+# Seconds before cached schema metadata is revalidated against the catalog
+SCHEMA_CACHE_TTL = 300
+
+# Tables whose schema is cached, least recently used dropped first
+SCHEMA_CACHE_SIZE = 256
+
+# Seconds to wait for a free pooled connection before giving up
+ACQUIRE_TIMEOUT = 30
+
+# Seconds a metadata snapshot is reused before a fresh one is taken
+META_SNAPSHOT_TTL = 60
+
+# Errors meaning the connection was lost, rather than the statement failing
+CONNECTION_ERRORS = (
+    OSError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.IdleInTransactionSessionTimeoutError,
+    asyncpg.AdminShutdownError,
+)
+
+# Prepared statements cached per connection, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+# Cheap catalog fingerprints used to detect DDL since metadata was cached
+TABLES_VERSION_SQL = """
+    SELECT (SELECT count(*) || ':' || COALESCE(max(c.xmin::text::bigint), 0)
+            FROM pg_class c
+            WHERE c.relnamespace = 'public'::regnamespace)
+        || ':' || (SELECT count(*) || ':' || COALESCE(max(d.xmin::text::bigint), 0)
+                   FROM pg_description d
+                   JOIN pg_class c ON c.oid = d.objoid
+                   WHERE d.classoid = 'pg_class'::regclass
+                       AND d.objsubid = 0
+                       AND c.relnamespace = 'public'::regnamespace)
+"""
+
+TABLE_VERSION_SQL = """
+    SELECT c.xmin::text
+        || ':' || (SELECT count(*) || ':' || COALESCE(max(a.xmin::text::bigint), 0)
+                   FROM pg_attribute a WHERE a.attrelid = c.oid)
+        || ':' || (SELECT count(*) || ':' || COALESCE(max(x.xmin::text::bigint), 0)
+                   FROM pg_constraint x WHERE x.conrelid = c.oid)
+        || ':' || (SELECT count(*) || ':' || COALESCE(max(d.xmin::text::bigint), 0)
+                   FROM pg_description d WHERE d.objoid = c.oid)
+    FROM pg_class c
+    WHERE c.relname = $1
+        AND c.relnamespace = 'public'::regnamespace
+"""
+
+TABLES_JSON_SQL = """
+    SELECT COALESCE(json_agg(json_build_object(
+        'name', c.relname,
+        'description', obj_description(c.oid, 'pg_class')
+    ) ORDER BY c.relname), '[]'::json)::text
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public'
+        AND c.relkind IN ('r', 'v', 'm', 'p', 'f')
+        AND has_table_privilege(c.oid, 'SELECT')
+"""
+
+# Returns the catalog version plus the table list as a JSON array, which is
+# only built when the version differs from the cached one ($1)
+TABLES_SQL = f"""
+    WITH _v AS MATERIALIZED (
+        SELECT ({TABLES_VERSION_SQL}) AS version
+    )
+    SELECT
+        version,
+        CASE WHEN version IS DISTINCT FROM $1 THEN ({TABLES_JSON_SQL}) END as tables
+    FROM _v
+"""
+
+SCHEMA_JSON_SQL = """
+    SELECT json_build_object(
+        'columns', COALESCE((
+            SELECT json_agg(json_build_object(
+                'name', a.attname,
+                'type', format_type(a.atttypid, a.atttypmod),
+                'nullable', NOT a.attnotnull,
+                'description', col_description(c.oid, a.attnum)
+            ) ORDER BY a.attnum)
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            WHERE c.relname = $1
+                AND c.relnamespace = 'public'::regnamespace
+                AND c.relkind IN ('r', 'v', 'm', 'p', 'f')
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+        ), '[]'::json),
+        'constraints', COALESCE((
+            SELECT json_agg(json_build_object(
+                'name', conname,
+                'type', contype
+            ))
+            FROM pg_constraint c
+            JOIN pg_class t ON c.conrelid = t.oid
+            WHERE t.relname = $1
+                AND t.relnamespace = 'public'::regnamespace
+        ), '[]'::json)
+    )::text
+"""
+
+# Returns the table's catalog version plus its schema document, which is only
+# built when the version differs from the cached one ($2)
+SCHEMA_SQL = f"""
+    WITH _v AS MATERIALIZED (
+        SELECT ({TABLE_VERSION_SQL}) AS version
+    )
+    SELECT
+        version,
+        CASE WHEN version IS DISTINCT FROM $2 THEN ({SCHEMA_JSON_SQL}) END as schema
+    FROM _v
+"""
+
+# Wraps a SELECT so PostgreSQL serializes each row to JSON text; the user query
+# goes on its own lines so trailing comments stay harmless
+QUERY_ROWS_SQL = """
+    SELECT row_to_json(_q)::text
+    FROM (
+{sql}
+    ) _q
+"""
+
+# Rows fetched per round trip when a query with bound parameters is read
+# through a cursor
+QUERY_FETCH_SIZE = 2000
+
+# Queries whose column names are remembered for empty results, keyed by SQL text
+QUERY_COLUMNS_CACHE_SIZE = 1024
+
+# Backslash escapes emitted by COPY TO in text format
+COPY_ESCAPES = {'\\': '\\', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+COPY_ESCAPE_PATTERN = re.compile(r'\\([\\bfnrtv])')
+
+def _unescape_copy_text(text: str) -> str:
+    """Undo COPY text format escaping"""
+    if '\\' not in text:
+        return text
+    return COPY_ESCAPE_PATTERN.sub(lambda m: COPY_ESCAPES[m.group(1)], text)
+
+def _json_keys(json_row: str) -> list[str]:
+    """Return the top-level keys of a JSON object in order, keeping duplicates"""
+    return [key for key, _ in json.loads(json_row, object_pairs_hook=list)]
+
 class PostgresHandler(DatabaseHandler):
     @property
     def db_type(self) -> str:
@@ -23,133 +176,341 @@ class PostgresHandler(DatabaseHandler):
         super().__init__(config_path, database, debug)
         self.config = PostgresConfig.from_yaml(config_path, database)
 
-        # No connection pool creation during initialization
+        # Connection pool is created lazily on first use, since it must be awaited
         masked_params = self.config.get_masked_connection_info()
         self.log("debug", f"Configuring database with parameters: {masked_params}")
         self.pool = None
+        self._pool_lock = asyncio.Lock()
+
+        # Metadata reads share a read-only snapshot on a dedicated connection
+        self._meta_conn: Optional[asyncpg.Connection] = None
+        self._meta_tx = None
+        self._meta_started = 0.0
+        self._meta_expiry = None
+        self._meta_expiry_task = None
+        self._meta_lock = asyncio.Lock()
+
+        # Resource URIs share this prefix, followed by "<table>/schema"
+        self._uri_prefix = f"postgres://{self.database}/"
+
+        # Schema metadata cache entries: (validated_at, catalog_version, value)
+        self._tables_cache: Optional[tuple[float, Any, list[types.Resource]]] = None
+        self._schema_cache: OrderedDict[str, tuple[float, Any, str]] = OrderedDict()
+        # Column names of recent queries: (seen_at, columns), least recently used first
+        self._columns_cache: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Get connection pool, creating it on first use"""
+        async with self._pool_lock:
+            if self.pool is None:
+                self.pool = await asyncpg.create_pool(
+                    # Callers beyond max_size wait in acquire() for a free connection
+                    min_size=self.config.pool_min_size,
+                    max_size=self.config.pool_max_size,
+                    # Metadata statements are prepared once per connection and kept
+                    statement_cache_size=STATEMENT_CACHE_SIZE,
+                    max_cached_statement_lifetime=0,
+                    **self.config.get_connection_params()
+                )
+                self.log("debug", "Connection pool created")
+            return self.pool
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Acquire a pooled connection and release it when done
+
+        Raises:
+            ConnectionError: If the server is unreachable or no connection frees up in time
+        """
+        try:
+            pool = await self._get_pool()
+            conn = await pool.acquire(timeout=ACQUIRE_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncpg.InterfaceError) as e:
+            raise ConnectionError(f"Failed to acquire database connection: {str(e)}") from e
+        try:
+            yield conn
+        finally:
+            await pool.release(conn)
+
+    @asynccontextmanager
+    async def _acquire_meta(self) -> AsyncIterator[asyncpg.Connection]:
+        """Acquire the metadata connection inside its shared snapshot
+
+        The connection stays in a REPEATABLE READ READ ONLY transaction that is
+        restarted once older than META_SNAPSHOT_TTL, and after any error.
+
+        Raises:
+            ConnectionError: If the server is unreachable
+        """
+        async with self._meta_lock:
+            if self._meta_tx is not None and time.monotonic() - self._meta_started >= META_SNAPSHOT_TTL:
+                await self._end_meta_snapshot()
+            if self._meta_tx is None:
+                try:
+                    if self._meta_conn is None or self._meta_conn.is_closed():
+                        self._meta_conn = await asyncpg.connect(
+                            statement_cache_size=STATEMENT_CACHE_SIZE,
+                            max_cached_statement_lifetime=0,
+                            **self.config.get_connection_params()
+                        )
+                    tx = self._meta_conn.transaction(isolation='repeatable_read', readonly=True)
+                    await tx.start()
+                except (OSError, asyncio.TimeoutError, asyncpg.InterfaceError) as e:
+                    raise ConnectionError(f"Failed to acquire database connection: {str(e)}") from e
+                self._meta_tx = tx
+                self._meta_started = time.monotonic()
+                # Don't hold the snapshot (and back vacuum) while the server sits idle
+                self._meta_expiry = asyncio.get_running_loop().call_later(
+                    META_SNAPSHOT_TTL, self._on_meta_expiry
+                )
+            try:
+                yield self._meta_conn
+            except BaseException:
+                # A failed statement aborts the transaction; start over on next use
+                await self._end_meta_snapshot()
+                raise
+
+    async def _fetchrow_meta(self, query: str, *args) -> asyncpg.Record:
+        """Run a metadata query in the shared snapshot
+
+        A lost connection, such as one closed by the server's
+        idle_in_transaction_session_timeout, is retried once on a fresh
+        connection and snapshot.
+
+        Raises:
+            ConnectionError: If the connection is lost again
+        """
+        try:
+            async with self._acquire_meta() as conn:
+                return await conn.fetchrow(query, *args)
+        except CONNECTION_ERRORS as e:
+            self.log("debug", f"Metadata connection lost, retrying: {str(e)}")
+        try:
+            async with self._acquire_meta() as conn:
+                return await conn.fetchrow(query, *args)
+        except CONNECTION_ERRORS as e:
+            raise ConnectionError(f"Lost database connection: {str(e)}") from e
+
+    async def _end_meta_snapshot(self):
+        """Roll back the metadata snapshot transaction, if one is open"""
+        if self._meta_expiry is not None:
+            self._meta_expiry.cancel()
+            self._meta_expiry = None
+        tx, self._meta_tx = self._meta_tx, None
+        if tx is None or self._meta_conn.is_closed():
+            return
+        try:
+            await tx.rollback()
+        except (OSError, asyncpg.InterfaceError, asyncpg.PostgresError):
+            # Connection is unusable; reconnect on next use
+            self._meta_conn.terminate()
+
+    def _on_meta_expiry(self):
+        """Release an idle metadata snapshot once it reaches META_SNAPSHOT_TTL"""
+        self._meta_expiry = None
+
+        async def expire():
+            async with self._meta_lock:
+                if self._meta_tx is not None and time.monotonic() - self._meta_started >= META_SNAPSHOT_TTL:
+                    await self._end_meta_snapshot()
+
+        self._meta_expiry_task = asyncio.ensure_future(expire())
+
+    def clear_cache(self):
+        """Clear cached schema metadata"""
+        self._tables_cache = None
+        self._schema_cache.clear()
+        self._columns_cache.clear()
+        # Take a fresh snapshot on the next metadata read
+        self._meta_started = float('-inf')
+        self.log("debug", "Schema cache cleared")
 
     async def get_tables(self) -> list[types.Resource]:
         """Get all table resources"""
+        cached = self._tables_cache
+        if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            return cached[2]
+
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT
-                        table_name,
-                        obj_description(
-                            (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
-                            'pg_class'
-                        ) as description
-                    FROM information_schema.tables
-                    WHERE table_schema = 'public'
-                """)
-                tables = cur.fetchall()
-                return [
-                    types.Resource(
-                        uri=f"postgres://{self.database}/{table[0]}/schema",
-                        name=f"{table[0]} schema",
-                        description=table[1] if table[1] else None,
-                        mimeType="application/json"
-                    ) for table in tables
-                ]
-        except psycopg2.Error as e:
-            error_msg = f"Failed to get table list: [Code: {e.pgcode}] {e.pgerror or str(e)}"
+            # Revalidation and refetch share a single round trip
+            version, tables = await self._fetchrow_meta(TABLES_SQL, cached[1] if cached else '')
+
+            if cached and cached[1] == version:
+                self._tables_cache = (time.monotonic(), version, cached[2])
+                return cached[2]
+
+            resources = []
+            for table in json.loads(tables):
+                name = table['name']
+                resources.append(types.Resource(
+                    uri=self._uri_prefix + name + "/schema",
+                    name=name + " schema",
+                    description=table['description'] if table['description'] else None,
+                    mimeType="application/json"
+                ))
+            self._tables_cache = (time.monotonic(), version, resources)
+            return resources
+        except asyncpg.PostgresError as e:
+            error_msg = f"Failed to get table list: [Code: {e.sqlstate}] {str(e)}"
             self.stats.record_error(e.__class__.__name__)
             raise DatabaseError(error_msg)
-        finally:
-            if conn:
-                conn.close()
 
     async def get_schema(self, table_name: str) -> str:
         """Get table schema information"""
+        cached = self._schema_cache.get(table_name)
+        if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            self._schema_cache.move_to_end(table_name)
+            return cached[2]
+
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
-            with conn.cursor() as cur:
-                # Get column information
-                cur.execute("""
-                    SELECT
-                        column_name,
-                        data_type,
-                        is_nullable,
-                        col_description(
-                            (quote_ident(table_schema) || '.' || quote_ident(table_name))::regclass,
-                            ordinal_position
-                        ) as description
-                    FROM information_schema.columns
-                    WHERE table_name = %s
-                    ORDER BY ordinal_position
-                """, (table_name,))
-                columns = cur.fetchall()
-
-                # Get constraint information
-                cur.execute("""
-                    SELECT
-                        conname as constraint_name,
-                        contype as constraint_type
-                    FROM pg_constraint c
-                    JOIN pg_class t ON c.conrelid = t.oid
-                    WHERE t.relname = %s
-                """, (table_name,))
-                constraints = cur.fetchall()
-
-                return str({
-                    'columns': [{
-                        'name': col[0],
-                        'type': col[1],
-                        'nullable': col[2] == 'YES',
-                        'description': col[3]
-                    } for col in columns],
-                    'constraints': [{
-                        'name': con[0],
-                        'type': con[1]
-                    } for con in constraints]
-                })
-        except psycopg2.Error as e:
-            error_msg = f"Failed to read table schema: [Code: {e.pgcode}] {e.pgerror or str(e)}"
+            # Revalidation and refetch share a single round trip
+            version, schema = await self._fetchrow_meta(SCHEMA_SQL, table_name, cached[1] if cached else '')
+
+            if cached and cached[1] == version:
+                self._schema_cache[table_name] = (time.monotonic(), version, cached[2])
+                self._schema_cache.move_to_end(table_name)
+                return cached[2]
+
+            if version is None:
+                # Missing tables are not cached, so names from clients cannot grow the cache
+                self._schema_cache.pop(table_name, None)
+                return schema
+
+            self._schema_cache[table_name] = (time.monotonic(), version, schema)
+            self._schema_cache.move_to_end(table_name)
+            if len(self._schema_cache) > SCHEMA_CACHE_SIZE:
+                self._schema_cache.popitem(last=False)
+            return schema
+        except asyncpg.PostgresError as e:
+            error_msg = f"Failed to read table schema: [Code: {e.sqlstate}] {str(e)}"
             self.stats.record_error(e.__class__.__name__)
             raise DatabaseError(error_msg)
-        finally:
-            if conn:
-                conn.close()
+
+    async def _query_columns(self, conn: asyncpg.Connection, sql: str,
+                             first_row: Optional[str]) -> list[str]:
+        """Get the column names of a query, keeping duplicates
+
+        Names are read from the keys of the first JSON row, which list every
+        column in order. Empty results reuse the names last seen for the same
+        SQL text while younger than SCHEMA_CACHE_TTL, and otherwise describe
+        the statement.
+
+        Args:
+            conn: Connection the query ran on, still inside its transaction
+            sql: SQL text of the query, without the JSON wrapper
+            first_row: First row as JSON text, or None if there were no rows
+
+        Returns:
+            Column names in select-list order
+        """
+        now = time.monotonic()
+        if first_row is not None:
+            columns = _json_keys(first_row)
+        else:
+            cached = self._columns_cache.get(sql)
+            if cached is not None and now - cached[0] < SCHEMA_CACHE_TTL:
+                self._columns_cache.move_to_end(sql)
+                return cached[1]
+            stmt = await conn.prepare(sql)
+            columns = [attr.name for attr in stmt.get_attributes()]
+        self._columns_cache[sql] = (now, columns)
+        self._columns_cache.move_to_end(sql)
+        if len(self._columns_cache) > QUERY_COLUMNS_CACHE_SIZE:
+            self._columns_cache.popitem(last=False)
+        return columns
 
     async def _execute_query(self, sql: str) -> str:
         """Execute SQL query"""
-        conn = None
         try:
-            conn_params = self.config.get_connection_params()
-            conn = psycopg2.connect(**conn_params)
             self.log("debug", f"Executing query: {sql}")
 
-            with conn.cursor() as cur:
-                # Start read-only transaction
-                cur.execute("BEGIN TRANSACTION READ ONLY")
-                try:
-                    cur.execute(sql)
-                    results = cur.fetchall()
-                    columns = [desc[0] for desc in cur.description]
-                    formatted_results = [dict(zip(columns, row)) for row in results]
-
-                    result_text = str({
-                        'type': self.db_type,
-                        'columns': columns,
-                        'rows': formatted_results,
-                        'row_count': len(results)
-                    })
-
-                    self.log("debug", f"Query completed, returned {len(results)} rows")
-                    return result_text
-                finally:
-                    cur.execute("ROLLBACK")
-        except psycopg2.Error as e:
-            error_msg = f"[{self.db_type}] Query execution failed: [Code: {e.pgcode}] {e.pgerror or str(e)}"
+            select = first_keyword(sql) in SELECT_KEYWORDS
+            params = ()
+            if select:
+                # Literals become parameters so repeated queries share a cached plan
+                bound_sql, params = parameterize(sql)
+                wrapped = QUERY_ROWS_SQL.format(sql=bound_sql)
+
+            async with self._acquire() as conn:
+                # Run inside a read-only transaction
+                async with conn.transaction(readonly=True):
+                    first_row = None
+                    if params:
+                        # Reuses the connection's cached statement for this SQL text and
+                        # reads in batches, so only one batch of records is held at a time
+                        json_rows = [
+                            row[0] async for row in conn.cursor(wrapped, *params, prefetch=QUERY_FETCH_SIZE)
+                        ]
+                        if json_rows:
+                            first_row = json_rows[0]
+                    elif select:
+                        # COPY sends one JSON row per line; each chunk is converted as it
+                        # arrives, holding back only a trailing partial row
+                        parts = []
+                        pending = b""
+                        row_count = 0
+
+                        async def collect(data: bytes):
+                            nonlocal pending, row_count, first_row
+                            data = pending + data
+                            end = data.rfind(b"\n") + 1
+                            pending = data[end:]
+                            if end:
+                                text = data[:end].decode()
+                                if first_row is None:
+                                    first_row = _unescape_copy_text(text[:text.index("\n")])
+                                row_count += text.count("\n")
+                                # Raw newlines only separate rows; escaped ones are restored afterwards
+                                parts.append(_unescape_copy_text(text.replace("\n", ",")))
+
+                        await conn.copy_from_query(wrapped, output=collect, format='text')
+                    if select:
+                        columns = await self._query_columns(conn, bound_sql, first_row)
+                    else:
+                        stmt = await conn.prepare(sql)
+                        results = await stmt.fetch()
+                        columns = [attr.name for attr in stmt.get_attributes()]
+
+            # The connection is back in the pool before the response is assembled
+            if select:
+                if params:
+                    row_count = len(json_rows)
+                    rows = ",".join(json_rows)
+                else:
+                    # Every row was followed by a comma; drop the last one
+                    if parts:
+                        parts[-1] = parts[-1][:-1]
+                    rows = "".join(parts)
+                result_text = (
+                    f'{{"type": "{self.db_type}", "columns": {json.dumps(columns)}, '
+                    f'"rows": [{rows}], "row_count": {row_count}}}'
+                )
+            else:
+                row_count = len(results)
+                result_text = json.dumps({
+                    'type': self.db_type,
+                    'columns': columns,
+                    'rows': [dict(row) for row in results],
+                    'row_count': row_count
+                }, default=str)
+
+            self.log("debug", f"Query completed, returned {row_count} rows")
+            return result_text
+        except asyncpg.PostgresError as e:
+            error_msg = f"[{self.db_type}] Query execution failed: [Code: {e.sqlstate}] {str(e)}"
             raise DatabaseError(error_msg)
-        finally:
-            if conn:
-                conn.close()
+        except (OSError, asyncpg.InterfaceError) as e:
+            raise ConnectionError(f"[{self.db_type}] Lost database connection: {str(e)}") from e
 
     async def cleanup(self):
         """Cleanup resources"""
         # Log final stats before cleanup
         self.log("info", f"Final PostgreSQL handler stats: {self.stats.to_dict()}")
+        async with self._meta_lock:
+            await self._end_meta_snapshot()
+            if self._meta_conn is not None:
+                await self._meta_conn.close()
+                self._meta_conn = None
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
@@ -0,0 +1,256 @@
+"""SQL statement classification utilities"""
+
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+# Keywords that can start a read-only query
+SELECT_KEYWORDS = frozenset({'SELECT', 'WITH', 'VALUES', 'TABLE'})
+
+# Keywords that start a data-modifying statement
+WRITE_KEYWORDS = frozenset({'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'REPLACE'})
+
+# Characters that make up comparison operators
+_COMPARISON_CHARS = frozenset('<>=!')
+
+# Keywords whose numeric argument can be bound as a parameter
+_PARAMETER_KEYWORDS = frozenset({'LIMIT', 'OFFSET'})
+
+_INT4_RANGE = range(-2**31, 2**31)
+_INT8_RANGE = range(-2**63, 2**63)
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<escape_string>(?<![\w$])[eE]'(?:[^'\\]|''|\\.)*')
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<identifier>"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\])
+  | (?P<dollar_quote>\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$)
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<symbol>.)
+""", re.VERBOSE | re.DOTALL)
+
+def _iter_tokens(sql: str) -> Iterator[tuple[str, str, int]]:
+    """Yield (kind, text, start) tokens; see tokenize
+
+    An unterminated string or comment ends the scan with an 'error' token.
+    """
+    pos = 0
+    length = len(sql)
+    while pos < length:
+        match = _TOKEN_PATTERN.match(sql, pos)
+        kind = match.lastgroup
+        end = match.end()
+        if kind == 'block_comment':
+            # Block comments nest in PostgreSQL
+            depth = 1
+            while depth:
+                next_open = sql.find('/*', end)
+                next_close = sql.find('*/', end)
+                if next_close < 0:
+                    yield ('error', '', pos)
+                    return
+                if 0 <= next_open < next_close:
+                    depth += 1
+                    end = next_open + 2
+                else:
+                    depth -= 1
+                    end = next_close + 2
+        elif kind == 'dollar_quote':
+            close = sql.find(match.group(), end)
+            if close < 0:
+                yield ('error', '', pos)
+                return
+            end = close + len(match.group())
+            yield ('string', sql[pos:end], pos)
+        elif kind == 'word':
+            yield (kind, match.group().upper(), pos)
+        elif kind == 'symbol' and match.group() in '\'"`[':
+            # Quote that never closes
+            yield ('error', '', pos)
+            return
+        elif kind not in ('space', 'comment'):
+            yield (kind, match.group(), pos)
+        pos = end
+
+def _scan(sql: str) -> Optional[list[tuple[str, str, int]]]:
+    """Split SQL into (kind, text, start) tokens, or None if left unterminated"""
+    tokens = []
+    for token in _iter_tokens(sql):
+        if token[0] == 'error':
+            return None
+        tokens.append(token)
+    return tokens
+
+def tokenize(sql: str) -> Optional[list[tuple[str, str]]]:
+    """Split SQL into (kind, text) tokens, skipping whitespace and comments
+
+    Words are returned upper-cased. Strings, quoted identifiers and
+    dollar-quoted bodies are returned as single tokens.
+
+    Args:
+        sql: SQL text
+
+    Returns:
+        List of tokens, or None if a string or comment is left unterminated
+    """
+    tokens = _scan(sql)
+    if tokens is None:
+        return None
+    return [(kind, text) for kind, text, _ in tokens]
+
+def _first_word(tokens: list[tuple[str, str]]) -> str:
+    """Return the first word token, skipping opening parentheses"""
+    for kind, text in tokens:
+        if kind == 'word':
+            return text
+        if text != '(':
+            break
+    return ''
+
+def first_keyword(sql: str) -> str:
+    """Return the upper-cased first keyword of a statement, skipping comments and parentheses
+
+    Only the leading tokens are scanned, so the cost does not grow with the query length.
+    """
+    for kind, text, _ in _iter_tokens(sql):
+        if kind == 'word':
+            return text
+        if text != '(':
+            break
+    return ''
+
+@lru_cache(maxsize=1024)
+def is_select_query(sql: str) -> bool:
+    """Check whether SQL is a single read-only query
+
+    Accepts one SELECT, WITH, VALUES or TABLE statement (optionally
+    parenthesized, with trailing semicolons). A WITH clause must be followed
+    by SELECT, VALUES or TABLE at its own level. SELECT INTO, FOR UPDATE and
+    INSERT, UPDATE, DELETE, MERGE or REPLACE anywhere else, such as in a CTE
+    body, are rejected; those words are only allowed as function names.
+
+    Args:
+        sql: SQL text
+
+    Returns:
+        True if the statement only reads data
+    """
+    tokens = tokenize(sql)
+    if not tokens:
+        return False
+    while tokens and tokens[-1][1] == ';':
+        tokens.pop()
+    first_word = _first_word(tokens)
+    if first_word not in SELECT_KEYWORDS:
+        return False
+
+    depth = 0
+    top = None
+    main_word = None
+    for i, (kind, text) in enumerate(tokens):
+        if text == '(':
+            depth += 1
+        elif text == ')':
+            depth -= 1
+        elif text == ';':
+            return False
+        if kind != 'word':
+            continue
+        if top is None:
+            # Level of the leading keyword, inside any opening parentheses
+            top = depth
+        elif main_word is None and depth == top and text in SELECT_KEYWORDS | WRITE_KEYWORDS:
+            # First statement keyword after WITH and its CTE list
+            main_word = text
+        if text == 'INTO':
+            return False
+        if text in WRITE_KEYWORDS and not (i + 1 < len(tokens) and tokens[i + 1][1] == '('):
+            return False
+    if first_word == 'WITH' and main_word not in SELECT_KEYWORDS:
+        return False
+    return True
+
+def _bindable(tokens: list[tuple[str, str, int]], i: int) -> bool:
+    """Check whether the number at tokens[i] follows a comparison operator or LIMIT/OFFSET"""
+    j = i - 1
+    # Operators such as >= arrive as adjacent one-character symbols
+    while j >= 0 and tokens[j][0] == 'symbol' and tokens[j][1] in _COMPARISON_CHARS \
+            and (j == i - 1 or tokens[j][2] + 1 == tokens[j + 1][2]):
+        j -= 1
+    if j == i - 1:
+        return j >= 0 and tokens[j][0] == 'word' and tokens[j][1] in _PARAMETER_KEYWORDS
+    # The operator must have an operand on its left, not be part of a longer one
+    return j >= 0 and (tokens[j][0] in ('word', 'identifier') or tokens[j][1] == ')') \
+        and i - 1 - j <= 2
+
+@lru_cache(maxsize=1024)
+def parameterize(sql: str) -> tuple[str, tuple[Any, ...]]:
+    """Replace numeric literals in comparisons and LIMIT/OFFSET with parameters
+
+    Queries that differ only in these literals then share one prepared
+    statement. Each placeholder is cast to the type PostgreSQL would give
+    the literal (int4, int8 or numeric), so the meaning is unchanged, and
+    repeated literals share a placeholder.
+    String literals are left inline since their type depends on context.
+    The statement is also cut after its last token other than a semicolon,
+    so it can be embedded in a subquery.
+
+    Args:
+        sql: SQL text of a single statement
+
+    Returns:
+        Rewritten SQL and the extracted values, which are empty when nothing
+        can be extracted; SQL that cannot be tokenized is returned unchanged
+    """
+    tokens = _scan(sql)
+    if tokens is None:
+        return sql, ()
+    # Trailing semicolons, and comments after the statement, would break a wrapper
+    while tokens and tokens[-1][1] == ';':
+        tokens.pop()
+    if not tokens:
+        return '', ()
+    sql = sql[:tokens[-1][2] + len(tokens[-1][1])]
+    # Existing $n placeholders would clash with the generated ones
+    if any(text == '$' for _, text, _ in tokens):
+        return sql, ()
+
+    parts = []
+    values = []
+    placeholders = {}
+    last = 0
+    for i, (kind, text, start) in enumerate(tokens):
+        if kind != 'number' or not _bindable(tokens, i):
+            continue
+        end = start + len(text)
+        # A number running into a word (such as 1_000) is not a plain literal
+        if end < len(sql) and (sql[end].isalnum() or sql[end] in '_$'):
+            continue
+        # Repeated literals share a placeholder, so expressions in GROUP BY,
+        # DISTINCT ON or ORDER BY still match the select list
+        if text not in placeholders:
+            if '.' in text or 'e' in text.lower():
+                value, type_name = Decimal(text), 'numeric'
+            else:
+                value = int(text)
+                if value in _INT4_RANGE:
+                    type_name = 'int4'
+                elif value in _INT8_RANGE:
+                    type_name = 'int8'
+                else:
+                    value, type_name = Decimal(text), 'numeric'
+            values.append(value)
+            # Parenthesized, so the cast is valid wherever a bare constant was,
+            # e.g. before ROWS in OFFSET ... ROWS
+            placeholders[text] = f"(${len(values)}::{type_name})"
+        parts.append(sql[last:start])
+        parts.append(placeholders[text])
+        last = end
+    if not values:
+        return sql, ()
+    parts.append(sql[last:])
+    return "".join(parts), tuple(values)
@@ -1,11 +1,14 @@
 """SQLite database handler implementation"""
 
+import asyncio
+import json
 import sqlite3
 from pathlib import Path
 from contextlib import closing
 import mcp.types as types
 
 from ..base import DatabaseHandler, DatabaseError
+from ..sql import SELECT_KEYWORDS, first_keyword, is_select_query
 from .config import SqliteConfig
 
 class SqliteHandler(DatabaseHandler):
@@ -28,6 +31,9 @@ class SqliteHandler(DatabaseHandler):
         db_file = Path(self.config.absolute_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # Resource URIs share this prefix, followed by "<table>/schema"
+        self._uri_prefix = f"sqlite://{self.database}/"
+
         # No connection test during initialization
         self.log("debug", f"Configuring database: {self.config.get_masked_connection_info()}")
 
@@ -36,93 +42,107 @@ class SqliteHandler(DatabaseHandler):
         connection_params = self.config.get_connection_params()
         conn = sqlite3.connect(**connection_params)
         conn.row_factory = sqlite3.Row
+        # Reject writes at the connection level too, not only in the statement check
+        conn.execute("PRAGMA query_only = ON")
         return conn
 
+    def _get_tables_sync(self) -> list[types.Resource]:
+        """Get all table resources (blocking)"""
+        with closing(self._get_connection()) as conn:
+            cursor = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+            tables = cursor.fetchall()
+
+            resources = []
+            for (name,) in tables:
+                resources.append(types.Resource(
+                    uri=self._uri_prefix + name + "/schema",
+                    name=name + " schema",
+                    mimeType="application/json"
+                ))
+            return resources
+
     async def get_tables(self) -> list[types.Resource]:
         """Get all table resources"""
         try:
-            with closing(self._get_connection()) as conn:
-                cursor = conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                )
-                tables = cursor.fetchall()
-
-                return [
-                    types.Resource(
-                        uri=f"sqlite://{self.database}/{table[0]}/schema",
-                        name=f"{table[0]} schema",
-                        mimeType="application/json"
-                    ) for table in tables
-                ]
+            return await asyncio.to_thread(self._get_tables_sync)
         except sqlite3.Error as e:
             error_msg = f"Failed to get table list: {str(e)}"
             self.log("error", error_msg)
             raise
 
+    def _get_schema_sync(self, table_name: str) -> str:
+        """Get table schema information (blocking)"""
+        with closing(self._get_connection()) as conn:
+            # Get table structure
+            cursor = conn.execute(f"PRAGMA table_info({table_name})")
+            columns = cursor.fetchall()
+
+            # Get index information
+            cursor = conn.execute(f"PRAGMA index_list({table_name})")
+            indexes = cursor.fetchall()
+
+            schema_info = {
+                'columns': [{
+                    'name': col['name'],
+                    'type': col['type'],
+                    'nullable': not col['notnull'],
+                    'primary_key': bool(col['pk'])
+                } for col in columns],
+                'indexes': [{
+                    'name': idx['name'],
+                    'unique': bool(idx['unique'])
+                } for idx in indexes]
+            }
+
+            return json.dumps(schema_info)
+
     async def get_schema(self, table_name: str) -> str:
         """Get table schema information"""
         try:
-            with closing(self._get_connection()) as conn:
-                # Get table structure
-                cursor = conn.execute(f"PRAGMA table_info({table_name})")
-                columns = cursor.fetchall()
-
-                # Get index information
-                cursor = conn.execute(f"PRAGMA index_list({table_name})")
-                indexes = cursor.fetchall()
-
-                schema_info = {
-                    'columns': [{
-                        'name': col['name'],
-                        'type': col['type'],
-                        'nullable': not col['notnull'],
-                        'primary_key': bool(col['pk'])
-                    } for col in columns],
-                    'indexes': [{
-                        'name': idx['name'],
-                        'unique': bool(idx['unique'])
-                    } for idx in indexes]
-                }
-
-                return str(schema_info)
+            return await asyncio.to_thread(self._get_schema_sync, table_name)
         except sqlite3.Error as e:
             error_msg = f"Failed to read table schema: {str(e)}"
             self.log("error", error_msg)
             raise
 
+    def _execute_query_sync(self, sql: str) -> str:
+        """Execute SQL query (blocking)"""
+        with closing(self._get_connection()) as conn:
+            # Rows are rebuilt as dicts below, so fetch plain tuples instead of sqlite3.Row
+            conn.row_factory = None
+            cursor = conn.execute(sql)
+            if cursor.description is None:
+                raise DatabaseError("cannot execute statement that returns no rows")
+            results = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
+
+        # The connection is closed before the response is assembled
+        formatted_results = [dict(zip(columns, row)) for row in results]
+
+        result_text = json.dumps({
+            'type': self.db_type,
+            'columns': columns,
+            'rows': formatted_results,
+            'row_count': len(results)
+        }, default=str)
+
+        self.log("debug", f"Query completed, returned {len(results)} rows")
+        return result_text
+
     async def _execute_query(self, sql: str) -> str:
         """Execute SQL query"""
-        # Check for non-SELECT queries
-        sql_lower = sql.lower().strip()
-        if not sql_lower.startswith('select'):
-            error_msg = "cannot execute DELETE statement"
-            if sql_lower.startswith('delete'):
-                error_msg = "cannot execute DELETE statement"
-            elif sql_lower.startswith('update'):
-                error_msg = "cannot execute UPDATE statement"
-            elif sql_lower.startswith('insert'):
-                error_msg = "cannot execute INSERT statement"
-            raise DatabaseError(error_msg)
+        # Check for non-SELECT queries without copying the SQL text
+        if not is_select_query(sql):
+            keyword = first_keyword(sql)
+            if not keyword or keyword in SELECT_KEYWORDS:
+                raise DatabaseError("cannot execute non-read-only statement")
+            raise DatabaseError(f"cannot execute {keyword} statement")
 
         try:
-            with closing(self._get_connection()) as conn:
-                self.log("debug", f"Executing query: {sql}")
-                cursor = conn.execute(sql)
-                results = cursor.fetchall()
-
-                columns = [desc[0] for desc in cursor.description]
-                formatted_results = [dict(zip(columns, row)) for row in results]
-
-                result_text = str({
-                    'type': self.db_type,
-                    'columns': columns,
-                    'rows': formatted_results,
-                    'row_count': len(results)
-                })
-
-                self.log("debug", f"Query completed, returned {len(results)} rows")
-                return result_text
-
+            self.log("debug", f"Executing query: {sql}")
+            return await asyncio.to_thread(self._execute_query_sync, sql)
         except sqlite3.Error as e:
             error_msg = f"[{self.db_type}] Query execution failed: {str(e)}"
             raise DatabaseError(error_msg)
@@ -73,6 +73,7 @@ async def test_postgres_monitoring(postgres_db, mcp_config):
             assert stats_dict["query_count"] == 3  # Two successful queries + one failed query
             assert stats_dict["error_count"] == 1
             assert isinstance(stats_dict["connection_duration"], (int, float))
+        await server.cleanup()
 
         # After context exit, connection should be closed
         assert stats.active_connections == 0
@@ -1,7 +1,10 @@
+import asyncio
+import asyncpg
+import json
 import pytest
 import tempfile
 import yaml
-from mcp_dbutils.base import DatabaseServer, ConfigurationError, DatabaseError
+from mcp_dbutils.base import DatabaseServer, ConfigurationError, DatabaseError, ConnectionError
 from mcp_dbutils.log import create_logger
 
 # 创建测试用的 logger
@@ -23,13 +26,15 @@ async def test_list_tables(postgres_db, mcp_config):
 
             # Check schema information
             schema_str = await handler.get_schema("users")
-            schema = eval(schema_str)
+            schema = json.loads(schema_str)
             assert schema["columns"][0]["name"] == "id"
             assert schema["columns"][0]["type"] == "integer"
             assert schema["columns"][1]["name"] == "name" 
             assert schema["columns"][1]["type"] == "text"
             assert schema["columns"][2]["name"] == "email"
             assert schema["columns"][2]["type"] == "text"
+            assert {"name": "users_pkey", "type": "p"} in schema["constraints"]
+        await server.cleanup()
 
 @pytest.mark.asyncio
 async def test_execute_query(postgres_db, mcp_config):
@@ -41,7 +46,7 @@ async def test_execute_query(postgres_db, mcp_config):
         async with server.get_handler("test_pg") as handler:
                 # Simple SELECT
                 result_str = await handler.execute_query("SELECT name FROM users ORDER BY name")
-                result = eval(result_str)
+                result = json.loads(result_str)
                 assert len(result["rows"]) == 2
                 assert result["rows"][0]["name"] == "Alice"
                 assert result["rows"][1]["name"] == "Bob"
@@ -50,10 +55,54 @@ async def test_execute_query(postgres_db, mcp_config):
                 result_str = await handler.execute_query(
                     "SELECT * FROM users WHERE email = 'alice@test.com'"
                 )
-                result = eval(result_str)
+                result = json.loads(result_str)
                 assert len(result["rows"]) == 1
                 assert result["rows"][0]["name"] == "Alice"
 
+                # Results spanning several cursor batches
+                result_str = await handler.execute_query("SELECT g FROM generate_series(1, 4500) g")
+                result = json.loads(result_str)
+                assert result["columns"] == ["g"]
+                assert result["row_count"] == 4500
+                assert [row["g"] for row in result["rows"]] == list(range(1, 4501))
+
+                # Values are rendered by the server, never cast to Python objects
+                result_str = await handler.execute_query(
+                    "SELECT 12345678901234567890.120::numeric AS n, "
+                    "'2024-01-02 03:04:05.5'::timestamp AS ts"
+                )
+                assert '"n":12345678901234567890.120' in result_str
+                assert '"ts":"2024-01-02T03:04:05.5"' in result_str
+
+                # Backslashes, quotes and raw whitespace inside json values survive COPY
+                result_str = await handler.execute_query(
+                    "SELECT E'a\\\\b \"q\"' AS s, E'{\"k\":\\n\\t1}'::json AS j "
+                    "FROM generate_series(1, 2)"
+                )
+                result = json.loads(result_str)
+                assert result["columns"] == ["s", "j"]
+                assert result["row_count"] == 2
+                assert result["rows"][1] == {"s": 'a\\b "q"', "j": {"k": 1}}
+
+                # Multibyte text and escapes across many COPY chunks
+                result = json.loads(await handler.execute_query(
+                    "SELECT g, repeat(E'\u00e9\\\\', 50) AS s, E'{\"k\":\\n1}'::json AS j "
+                    "FROM generate_series(1, 3000) g"
+                ))
+                assert result["row_count"] == 3000
+                assert all(row == {"g": i, "s": "\u00e9\\" * 50, "j": {"k": 1}}
+                           for i, row in enumerate(result["rows"], 1))
+
+                # Column names keep duplicates, and are known even with no rows
+                result = json.loads(await handler.execute_query("SELECT name, name, 1, 2 FROM users WHERE false"))
+                assert result["columns"] == ["name", "name", "?column?", "?column?"]
+                assert result["row_count"] == 0
+
+                # A semicolon followed by a comment still ends the statement
+                result = json.loads(await handler.execute_query("SELECT 1 AS one; -- note"))
+                assert result["rows"] == [{"one": 1}]
+        await server.cleanup()
+
 @pytest.mark.asyncio
 async def test_non_select_query(postgres_db, mcp_config):
     """Test that non-SELECT queries are rejected"""
@@ -64,6 +113,7 @@ async def test_non_select_query(postgres_db, mcp_config):
         async with server.get_handler("test_pg") as handler:
             with pytest.raises(DatabaseError, match="cannot execute DELETE in a read-only transaction"):
                 await handler.execute_query("DELETE FROM users")
+        await server.cleanup()
 
 @pytest.mark.asyncio
 async def test_invalid_query(postgres_db, mcp_config):
@@ -75,6 +125,21 @@ async def test_invalid_query(postgres_db, mcp_config):
         async with server.get_handler("test_pg") as handler:
             with pytest.raises(DatabaseError):
                 await handler.execute_query("SELECT * FROM nonexistent_table")
+        await server.cleanup()
+
+@pytest.mark.asyncio
+async def test_connection_failure(postgres_db, mcp_config):
+    """Test that an unreachable server raises ConnectionError"""
+    mcp_config["databases"]["test_pg"].update(host="127.0.0.1", port=1)
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(mcp_config, tmp)
+        tmp.flush()
+        server = DatabaseServer(config_path=tmp.name)
+        async with server.get_handler("test_pg") as handler:
+            with pytest.raises(ConnectionError):
+                await handler.execute_query("SELECT 1")
+            assert handler.pool is None
+        await server.cleanup()
 
 @pytest.mark.asyncio
 async def test_connection_cleanup(postgres_db, mcp_config):
@@ -85,3 +150,172 @@ async def test_connection_cleanup(postgres_db, mcp_config):
         server = DatabaseServer(config_path=tmp.name)
         async with server.get_handler("test_pg") as handler:
             await handler.get_tables()
+            assert handler._meta_conn is not None
+            await handler.execute_query("SELECT 1")
+            assert handler.pool is not None
+
+        # Handler and its pool are reused until the server is cleaned up
+        async with server.get_handler("test_pg") as same_handler:
+            assert same_handler is handler
+
+        await server.cleanup()
+        assert handler.pool is None
+        assert handler._meta_conn is None
+
+@pytest.mark.asyncio
+async def test_concurrent_queries(postgres_db, mcp_config):
+    """Test that concurrent queries share the connection pool"""
+    # More callers than connections: the extra ones wait for a free connection
+    mcp_config["databases"]["test_pg"]["pool_max_size"] = 2
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(mcp_config, tmp)
+        tmp.flush()
+        server = DatabaseServer(config_path=tmp.name)
+        async with server.get_handler("test_pg") as handler:
+            results = await asyncio.gather(*[
+                handler.execute_query("SELECT pg_sleep(0.1), name FROM users")
+                for _ in range(5)
+            ])
+            assert len(results) == 5
+            assert handler.pool.get_max_size() == 2
+        await server.cleanup()
+
+@pytest.mark.asyncio
+async def test_parameterized_queries(postgres_db, mcp_config, monkeypatch):
+    """Test that queries differing only in literals share a prepared statement"""
+    mcp_config["databases"]["test_pg"]["pool_max_size"] = 1
+    # Statements described outside the statement cache
+    described = []
+    prepare = asyncpg.Connection.prepare
+
+    async def counting_prepare(self, query, *args, **kwargs):
+        described.append(query)
+        return await prepare(self, query, *args, **kwargs)
+
+    monkeypatch.setattr(asyncpg.Connection, "prepare", counting_prepare)
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(mcp_config, tmp)
+        tmp.flush()
+        server = DatabaseServer(config_path=tmp.name)
+        async with server.get_handler("test_pg") as handler:
+            for user_id, name in ((1, "Alice"), (2, "Bob")):
+                result = json.loads(await handler.execute_query(f"SELECT name FROM users WHERE id = {user_id}"))
+                assert result["columns"] == ["name"]
+                assert result["rows"] == [{"name": name}]
+
+            # Columns of non-empty results are read from the rows themselves
+            assert described == []
+
+            # Empty results describe the statement once, then reuse its columns
+            for _ in range(2):
+                result = json.loads(await handler.execute_query("SELECT name FROM users WHERE id > 99"))
+                assert result == {"type": "postgres", "columns": ["name"], "rows": [], "row_count": 0}
+            assert len(described) == 1
+
+            async with handler._acquire() as conn:
+                statements = [
+                    row["statement"] for row in await conn.fetch("SELECT statement FROM pg_prepared_statements")
+                    if "row_to_json" in row["statement"]
+                ]
+            assert len(statements) == 2
+            assert all("WHERE id" in statement and "($1::int4)" in statement for statement in statements)
+
+            # Repeated literals keep GROUP BY expressions matching the select list
+            result = json.loads(await handler.execute_query(
+                "SELECT id > 1 AS later, count(*) AS n FROM users GROUP BY id > 1 ORDER BY id > 1"
+            ))
+            assert result["rows"] == [{"later": False, "n": 1}, {"later": True, "n": 1}]
+
+            # SQL:2008 OFFSET ... ROWS FETCH ... form
+            result = json.loads(await handler.execute_query(
+                "SELECT name FROM users ORDER BY id OFFSET 1 ROWS FETCH NEXT 5 ROWS ONLY"
+            ))
+            assert result["rows"] == [{"name": "Bob"}]
+
+            # Bound queries are read in cursor batches
+            result = json.loads(await handler.execute_query("SELECT g FROM generate_series(1, 4500) g WHERE g > 0"))
+            assert result["row_count"] == 4500
+        await server.cleanup()
+
+@pytest.mark.asyncio
+async def test_metadata_reconnect(postgres_db, mcp_config, monkeypatch):
+    """Test that metadata reads recover after the server closes the idle snapshot"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(mcp_config, tmp)
+        tmp.flush()
+        server = DatabaseServer(config_path=tmp.name)
+        async with server.get_handler("test_pg") as handler:
+            async with handler._acquire() as conn:
+                await conn.execute(
+                    "DO $$ BEGIN EXECUTE format('ALTER DATABASE %I SET "
+                    "idle_in_transaction_session_timeout = 200', current_database()); END $$"
+                )
+            tables = await handler.get_tables()
+
+            # The server ends the idle metadata transaction and closes the connection
+            await asyncio.sleep(0.5)
+            monkeypatch.setattr("mcp_dbutils.postgres.handler.SCHEMA_CACHE_TTL", 0)
+            assert await handler.get_tables() is tables
+            assert "email" in await handler.get_schema("users")
+        await server.cleanup()
+
+@pytest.mark.asyncio
+async def test_schema_cache(postgres_db, mcp_config, monkeypatch):
+    """Test that schema metadata is cached and revalidated after DDL"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(mcp_config, tmp)
+        tmp.flush()
+        server = DatabaseServer(config_path=tmp.name)
+        async with server.get_handler("test_pg") as handler:
+            tables = await handler.get_tables()
+            schema_str = await handler.get_schema("users")
+
+            # Within the TTL the cached values are returned as-is
+            assert await handler.get_tables() is tables
+            assert await handler.get_schema("users") is schema_str
+
+            # After the TTL an unchanged catalog keeps the cached value
+            monkeypatch.setattr("mcp_dbutils.postgres.handler.SCHEMA_CACHE_TTL", 0)
+            assert await handler.get_schema("users") is schema_str
+
+            # Within the snapshot TTL metadata reads see a consistent catalog
+            async with handler._acquire() as conn:
+                await conn.execute("CREATE TABLE invisible (id integer)")
+            table_names = [table.name.replace(" schema", "") for table in await handler.get_tables()]
+            assert "invisible" not in table_names
+
+            # DDL changes the catalog version and invalidates the entry
+            monkeypatch.setattr("mcp_dbutils.postgres.handler.META_SNAPSHOT_TTL", 0)
+            async with handler._acquire() as conn:
+                await conn.execute("ALTER TABLE users ADD COLUMN age integer")
+                await conn.execute("CREATE TABLE orders (id integer)")
+            assert "age" in await handler.get_schema("users")
+            table_names = [table.name.replace(" schema", "") for table in await handler.get_tables()]
+            assert "orders" in table_names
+            assert "invisible" in table_names
+
+            # Table comments alone also change the table list version
+            async with handler._acquire() as conn:
+                await conn.execute("COMMENT ON TABLE users IS 'registered users'")
+            users = next(table for table in await handler.get_tables() if table.name == "users schema")
+            assert users.description == "registered users"
+
+            # Same-named tables in other schemas are ignored
+            async with handler._acquire() as conn:
+                await conn.execute("CREATE SCHEMA auth")
+                await conn.execute("CREATE TABLE auth.users (uid uuid PRIMARY KEY)")
+            handler.clear_cache()
+            schema = json.loads(await handler.get_schema("users"))
+            assert [col["name"] for col in schema["columns"]] == ["id", "name", "email", "age"]
+            assert {c["name"] for c in schema["constraints"]} == {"users_pkey", "users_email_key"}
+
+            # Missing tables are not cached, and the cache keeps only recent tables
+            await handler.get_schema("missing")
+            assert "missing" not in handler._schema_cache
+            monkeypatch.setattr("mcp_dbutils.postgres.handler.SCHEMA_CACHE_SIZE", 1)
+            await handler.get_schema("orders")
+            assert list(handler._schema_cache) == ["orders"]
+
+            handler.clear_cache()
+            assert handler._tables_cache is None
+        await server.cleanup()
@@ -1,7 +1,12 @@
+import asyncio
+import json
+import sqlite3
 import pytest
 import tempfile
 import yaml
+from contextlib import closing
 from pathlib import Path
+import mcp.types as types
 from mcp_dbutils.base import DatabaseServer, ConfigurationError, DatabaseError
 
 @pytest.mark.asyncio
@@ -18,7 +23,7 @@ async def test_list_tables(sqlite_db, mcp_config):
 
             # Check schema information
             schema_str = await handler.get_schema("products")
-            schema = eval(schema_str)
+            schema = json.loads(schema_str)
             assert schema["columns"][0]["name"] == "id"
             assert schema["columns"][0]["type"] == "INTEGER"
             assert schema["columns"][1]["name"] == "name"
@@ -37,7 +42,7 @@ async def test_execute_query(sqlite_db, mcp_config):
         async with server.get_handler("test_sqlite") as handler:
                 # Simple SELECT
                 result_str = await handler.execute_query("SELECT name FROM products ORDER BY price")
-                result = eval(result_str)
+                result = json.loads(result_str)
                 assert len(result["rows"]) == 2
                 assert result["rows"][0]["name"] == "Widget"  # $9.99
                 assert result["rows"][1]["name"] == "Gadget"  # $19.99
@@ -46,7 +51,7 @@ async def test_execute_query(sqlite_db, mcp_config):
                 result_str = await handler.execute_query(
                     "SELECT * FROM products WHERE price < 10.00"
                 )
-                result = eval(result_str)
+                result = json.loads(result_str)
                 assert len(result["rows"]) == 1
                 assert result["rows"][0]["name"] == "Widget"
                 assert float(result["rows"][0]["price"]) == 9.99
@@ -61,6 +66,23 @@ async def test_non_select_query(sqlite_db, mcp_config):
         async with server.get_handler("test_sqlite") as handler:
             with pytest.raises(DatabaseError, match="cannot execute DELETE statement"):
                 await handler.execute_query("DELETE FROM products")
+            with pytest.raises(DatabaseError, match="cannot execute UPDATE statement"):
+                await handler.execute_query("  /* note */ update products SET price = 0")
+            with pytest.raises(DatabaseError, match="cannot execute non-read-only statement"):
+                await handler.execute_query("SELECT 1; DELETE FROM products")
+            with pytest.raises(DatabaseError, match="cannot execute non-read-only statement"):
+                await handler.execute_query("WITH x AS (SELECT 1) DELETE FROM products WHERE id = 1")
+
+            # Statements without a result set are reported as DatabaseError
+            with pytest.raises(DatabaseError, match="returns no rows"):
+                await asyncio.to_thread(handler._execute_query_sync, "PRAGMA query_only = ON")
+            result = json.loads(await handler.execute_query("SELECT count(*) AS n FROM products"))
+            assert result["rows"] == [{"n": 2}]
+
+            # Connections are read-only even if a write got past the statement check
+            with closing(handler._get_connection()) as conn:
+                with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                    conn.execute("DELETE FROM products")
 
 @pytest.mark.asyncio
 async def test_invalid_query(sqlite_db, mcp_config):
@@ -82,3 +104,25 @@ async def test_connection_cleanup(sqlite_db, mcp_config):
         server = DatabaseServer(config_path=tmp.name)
         async with server.get_handler("test_sqlite") as handler:
             await handler.get_tables()
+
+@pytest.mark.asyncio
+async def test_query_tool_response(sqlite_db, mcp_config):
+    """Test that the query tool returns large results as a single JSON document"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml') as tmp:
+        yaml.dump(mcp_config, tmp)
+        tmp.flush()
+        server = DatabaseServer(config_path=tmp.name)
+        call_tool = server.server.request_handlers[types.CallToolRequest]
+        request = types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(name="query", arguments={
+                "database": "test_sqlite",
+                "sql": "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 5000) "
+                       "SELECT x, 'padding padding padding' AS p FROM c"
+            })
+        )
+        response = await call_tool(request)
+        assert not response.root.isError
+        assert len(response.root.content) == 1
+        result = json.loads(response.root.content[0].text)
+        assert result["row_count"] == 5000
@@ -0,0 +1,128 @@
+"""Unit tests for SQL statement classification"""
+
+import pytest
+from decimal import Decimal
+from mcp_dbutils.sql import tokenize, first_keyword, is_select_query, parameterize
+
+def test_tokenize():
+    """Test tokenizing SQL text"""
+    tokens = tokenize("select name -- comment\nFROM \"Users\" WHERE note = 'it''s; fine' /* a /* nested */ b */")
+    assert tokens == [
+        ('word', 'SELECT'),
+        ('word', 'NAME'),
+        ('word', 'FROM'),
+        ('identifier', '"Users"'),
+        ('word', 'WHERE'),
+        ('word', 'NOTE'),
+        ('symbol', '='),
+        ('string', "'it''s; fine'"),
+    ]
+
+    # Dollar quoting and numbers
+    assert tokenize("SELECT $tag$ ; DROP $tag$, 1.5e3") == [
+        ('word', 'SELECT'),
+        ('string', '$tag$ ; DROP $tag$'),
+        ('symbol', ','),
+        ('number', '1.5e3'),
+    ]
+
+    # Unterminated strings and comments
+    assert tokenize("SELECT 'abc") is None
+    assert tokenize("SELECT 1 /* open") is None
+
+def test_first_keyword():
+    """Test extracting the leading keyword"""
+    assert first_keyword("  select 1") == "SELECT"
+    assert first_keyword("-- leading comment\n(SELECT 1)") == "SELECT"
+    assert first_keyword("/* c */ delete from t") == "DELETE"
+    assert first_keyword("") == ""
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM users",
+    "select name from users;",
+    "  -- comment\nSELECT 1",
+    "(SELECT 1) UNION (SELECT 2)",
+    "WITH x AS (SELECT 1) SELECT * FROM x",
+    "VALUES (1), (2)",
+    "TABLE users",
+    "SELECT 'DELETE FROM users; DROP TABLE x'",
+    "SELECT update_time FROM t",
+    "SELECT replace(name, 'a', 'b') FROM users",
+    "(WITH x AS (SELECT 1) SELECT * FROM x)",
+    "WITH RECURSIVE c(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM c WHERE n < 3) SELECT n FROM c",
+])
+def test_select_queries_accepted(sql):
+    """Test that read-only queries are accepted"""
+    assert is_select_query(sql)
+
+@pytest.mark.parametrize("sql", [
+    "",
+    "-- only a comment",
+    "DELETE FROM users",
+    "SELECT 1; DROP TABLE users",
+    "SELECT 1; SELECT 2",
+    "WITH d AS (DELETE FROM users RETURNING *) SELECT * FROM d",
+    "WITH d AS MATERIALIZED (UPDATE users SET name = 'x' RETURNING *) SELECT 1",
+    "SELECT * INTO copy FROM users",
+    "SELECT 'unterminated",
+    "EXPLAIN ANALYZE DELETE FROM users",
+    "WITH x AS (SELECT 1) UPDATE products SET price = 0",
+    "WITH x AS (SELECT 1) DELETE FROM products WHERE id = 1",
+    "WITH x AS (SELECT 1) REPLACE INTO products VALUES (1)",
+    "WITH x AS (SELECT 1)",
+    "SELECT * FROM users FOR UPDATE",
+])
+def test_non_select_queries_rejected(sql):
+    """Test that writes and multiple statements are rejected"""
+    assert not is_select_query(sql)
+
+def test_parameterize():
+    """Test binding numeric literals as parameters"""
+    assert parameterize("SELECT * FROM t WHERE a = 5 AND b>=2.5 LIMIT 10 OFFSET 99999999999") == (
+        "SELECT * FROM t WHERE a = ($1::int4) AND b>=($2::numeric) LIMIT ($3::int4) OFFSET ($4::int8)",
+        (5, Decimal("2.5"), 10, 99999999999),
+    )
+    assert parameterize("SELECT * FROM t ORDER BY id OFFSET 10 ROWS FETCH NEXT 5 ROWS ONLY") == (
+        "SELECT * FROM t ORDER BY id OFFSET ($1::int4) ROWS FETCH NEXT 5 ROWS ONLY",
+        (10,),
+    )
+    assert parameterize('SELECT * FROM t WHERE f("X") <> 1e3') == (
+        'SELECT * FROM t WHERE f("X") <> ($1::numeric)',
+        (Decimal("1e3"),),
+    )
+
+def test_parameterize_trailing_semicolons():
+    """Test that trailing semicolons and the comments around them are removed"""
+    assert parameterize("SELECT 1; -- note") == ("SELECT 1", ())
+    assert parameterize("SELECT ';' ;; /* c */ ") == ("SELECT ';'", ())
+    assert parameterize("select x -- no semicolon") == ("select x", ())
+    assert parameterize("SELECT * FROM t WHERE a = 5;") == ("SELECT * FROM t WHERE a = ($1::int4)", (5,))
+    assert parameterize(";") == ("", ())
+
+def test_parameterize_repeated_literals():
+    """Test that repeated literals share one placeholder"""
+    assert parameterize("SELECT a > 2 FROM t GROUP BY a > 2") == (
+        "SELECT a > ($1::int4) FROM t GROUP BY a > ($1::int4)",
+        (2,),
+    )
+    assert parameterize(
+        "SELECT CASE WHEN price > 100 THEN 'high' END, count(*) FROM t "
+        "WHERE id < 100.0 GROUP BY CASE WHEN price > 100 THEN 'high' END"
+    ) == (
+        "SELECT CASE WHEN price > ($1::int4) THEN 'high' END, count(*) FROM t "
+        "WHERE id < ($2::numeric) GROUP BY CASE WHEN price > ($1::int4) THEN 'high' END",
+        (100, Decimal("100.0")),
+    )
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 1 FROM t ORDER BY 1",
+    "SELECT * FROM t WHERE 1 = 1",
+    "SELECT * FROM t WHERE a = -5",
+    "SELECT * FROM t WHERE a = '5'",
+    "SELECT * FROM t WHERE a = 1_000",
+    "SELECT * FROM t WHERE a = $1 AND b = 2",
+    "SELECT x::numeric(10, 2) FROM t",
+])
+def test_parameterize_leaves_literals(sql):
+    """Test that literals outside comparisons and LIMIT/OFFSET stay inline"""
+    assert parameterize(sql) == (sql, ())